@@ -14,29 +14,49 @@ Fitur Lengkap:
    - Exact Match (Jika hasil klik, cari persis).
    - URL State (Menyimpan hasil pencarian di URL browser).
 3. Performa:
-   - Gzip Compression.
+   - Gzip Compression (+ Brotli jika paket `brotli` terpasang), halaman & aset statis dikompresi sekali saat start.
    - Browser Caching.
-   - Pandas Vectorized Search.
+   - PyArrow Compute Search (kernel C++ di atas buffer kolom).
 
 Cara Pakai:
 1. Simpan file ini sebagai 'data_master.py'.
 2. Simpan file CSV sebagai 'master.csv'.
 3. Simpan file logo sebagai 'logo_bps.png' (atau sesuaikan variabel LOGO_FILENAME).
-4. Jalankan: python data_master.py
+4. (Opsional) Build CSS Tailwind sekali, tanpa compiler JIT di browser:
+   npx tailwindcss@3 -c tailwind.config.js -o static/tailwind.min.css --minify
+   Jika file ini tidak ada, halaman memakai Tailwind CDN.
+5. (Opsional) Self-host font Inter: simpan subset Latin (woff2) per berat sebagai
+   static/fonts/inter-400.woff2, inter-500, inter-600 & inter-700, mis. via
+   pyftsubset Inter.ttf --unicodes=U+0000-00FF --flavor=woff2 --output-file=static/fonts/inter-400.woff2
+   Jika belum lengkap, font diambil dari Google Fonts.
+6. Jalankan: python data_master.py
 """
 
+import gzip
+import hashlib
 import logging
+import mimetypes
 import re
 import os
-from functools import lru_cache
-from typing import List, Dict
+from functools import lru_cache, partial
+from typing import Callable, List, Dict, NamedTuple, Optional, Tuple
 
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import uvicorn
-from fastapi import FastAPI, Response
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import IdentityResponder
+
+try:
+    import brotli  # opsional: varian Brotli dari halaman utama
+except ImportError:
+    brotli = None
 
 # ==========================================
 # 1. KONFIGURASI & ASSETS
@@ -44,120 +64,527 @@ from fastapi.staticfiles import StaticFiles
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+class ORJSONResponse(JSONResponse):
+    """JSONResponse yang diserialisasi dengan orjson (langsung ke bytes, tanpa json.dumps stdlib)."""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
 app = FastAPI(
     title="Master Wilayah Indonesia",
     version="25.0.0",
     docs_url=None, 
-    redoc_url=None
+    redoc_url=None,
+    default_response_class=ORJSONResponse
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=500)
+# Body yang tidak berubah selama proses hidup dikompresi sekali saat import (gzip 9 / brotli 11),
+# lalu dipilih per request sesuai Accept-Encoding; GZipMiddleware hanya untuk response dinamis.
+ENCODINGS = ("br", "gzip")
+MIN_COMPRESS_SIZE = 500  # sama dengan minimum_size GZipMiddleware
+
+def compress_variants(body: bytes, media_type: str) -> Dict[str, bytes]:
+    """Body identity + varian gzip/br (br hanya jika paket brotli terpasang) untuk konten teks."""
+    variants = {"identity": body}
+    compressible = media_type.startswith("text/") or media_type.endswith(("javascript", "json", "xml"))
+    if not compressible or len(body) < MIN_COMPRESS_SIZE: return variants
+    variants["gzip"] = gzip.compress(body, 9)
+    if brotli: variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+@lru_cache(maxsize=64)
+def accepted_encodings(accept_encoding: str) -> frozenset:
+    """Encoding dari header Accept-Encoding yang diterima klien (q=0 berarti ditolak, * berarti semua)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        q = params.strip()
+        try:
+            if q.startswith("q=") and float(q[2:]) <= 0: continue
+        except ValueError:
+            continue
+        accepted.add(name.strip())
+    return frozenset(ENCODINGS) if "*" in accepted else frozenset(accepted)
+
+class NegotiatedGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware yang membaca Accept-Encoding lewat accepted_encodings (gzip;q=0 = ditolak).
+
+    GZipMiddleware bawaan hanya mencari substring "gzip", sehingga body identity yang sudah
+    dinegosiasikan encoded_response (dengan ETag identity) tetap dikompres.
+    """
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and "gzip" not in accepted_encodings(Headers(scope=scope).get("accept-encoding", "")):
+            await IdentityResponder(self.app, self.minimum_size)(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(NegotiatedGZipMiddleware, minimum_size=MIN_COMPRESS_SIZE)
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Apakah If-None-Match (daftar dipisah koma, boleh bentuk lemah W/ atau *) memuat etag ini."""
+    if not if_none_match: return False
+    # If-None-Match memakai perbandingan lemah (RFC 9110): awalan W/ diabaikan
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+def encoded_response(request: Request, variants: Dict[str, bytes], media_type: str, headers: Dict[str, str], etag: str) -> Response:
+    """Kirim varian terkompresi terbaik yang diterima klien (br > gzip > identity), atau 304 jika ETag-nya cocok."""
+    accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+    encoding = next((enc for enc in ENCODINGS if enc in variants and enc in accepted), "identity")
+    vary = {"Vary": "Accept-Encoding"} if len(variants) > 1 else {}
+    # Tiap content-coding adalah representasi berbeda -> ETag kuat berbeda ("<md5>-br", "<md5>-gzip")
+    headers = {**headers, "ETag": etag if encoding == "identity" else f'{etag[:-1]}-{encoding}"'}
+    if etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]): return Response(status_code=304, headers={**headers, **vary})
+    # Content-Encoding sudah diset -> GZipMiddleware meneruskan apa adanya (body identity diberi Vary oleh middleware)
+    if encoding != "identity": headers.update({"Content-Encoding": encoding, **vary})
+    return Response(variants[encoding], media_type=media_type, headers=headers)
+
+class StaticAsset(NamedTuple):
+    variants: Dict[str, bytes]
+    etag: str
+    media_type: str
+
+# Aset statis dibaca sekali ke memori (tanpa stat/open per request), dilayani di /static/{nama file}.
+# URL diberi versi dari hash isi file, sehingga aman di-cache immutable: isi baru = URL baru.
+static_assets: Dict[str, StaticAsset] = {}
+
+def add_static(name: str, body: bytes) -> str:
+    """Daftarkan isi aset di static_assets dan kembalikan URL berversinya."""
+    etag = '"' + hashlib.md5(body).hexdigest() + '"'
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    static_assets[name] = StaticAsset(compress_variants(body, media_type), etag, media_type)
+    return f"/static/{name}?v={etag[1:9]}"
+
+def register_static(path: str) -> str:
+    """Muat file ke static_assets dan kembalikan URL berversinya (file tidak ada -> URL polos, 404)."""
+    name = os.path.basename(path)
+    if not os.path.exists(path): return f"/static/{name}"
+    with open(path, "rb") as f: return add_static(name, f.read())
 
 # KONFIGURASI NAMA FILE LOGO (Ganti jika nama file Anda beda)
 LOGO_FILENAME = "logo_bps.png" 
+LOGO_URL = register_static(LOGO_FILENAME)
 
-# Mount folder static untuk serve gambar
-app.mount("/static", StaticFiles(directory="."), name="static")
+# CSS Tailwind hasil build (lihat tailwind.config.js); belum di-build -> fallback ke Tailwind CDN (JIT di browser)
+TAILWIND_CSS_PATH = os.path.join("static", "tailwind.min.css")
+TAILWIND_CSS_URL = register_static(TAILWIND_CSS_PATH) if os.path.exists(TAILWIND_CSS_PATH) else ""
 
 DATA_PATH = "master.csv"
-df_master: pd.DataFrame = pd.DataFrame()
+# Hasil normalisasi CSV disimpan sebagai file Arrow IPC lalu di-mmap read-only: dengan
+# `uvicorn --workers N` semua worker berbagi page cache OS yang sama, bukan salinan per heap.
+ARROW_CACHE_PATH = "master.arrow"
+# Naikkan setiap kali read_master_csv / master_table / ARROW_COLUMNS berubah: cache lama otomatis dibangun ulang
+ARROW_CACHE_VERSION = "1"
+# Seluruh data master sebagai pa.Table (zero-copy dari mmap); jalur request tidak menyentuh pandas
+master: pa.Table = pa.table({})
+# Kolom kode & pencarian dalam bentuk pyarrow.Array (buffer UTF-8 kontigu) untuk filter via pyarrow.compute
+arrow_cols: Dict[str, pa.Array] = {}
+
+ARROW_COLUMNS = [
+    "kode_prov", "kode_kab", "kode_kec", "kode_desa",
+    "_search_prov", "_search_kab", "_search_kec", "_search_desa",
+]
+
+# Panjang kode lengkap per kolom; kode juga disimpan sebagai uint16 untuk perbandingan integer
+CODE_LEN = {"kode_prov": 2, "kode_kab": 2, "kode_kec": 3, "kode_desa": 3}
+CODE_NA = np.iinfo(np.uint16).max  # kode non-angka (tidak pernah sama dengan kode <= 999)
+code_ints: Dict[str, np.ndarray] = {}
+
+SEARCH_COLUMNS = ["_search_prov", "_search_kab", "_search_kec", "_search_desa"]
+# Prefilter pencarian: codepoint karakter pertama tiap baris & himpunan karakter yang muncul per kolom
+first_chars: Dict[str, np.ndarray] = {}
+col_chars: Dict[str, frozenset] = {}
+
+# Inverted index hierarki kode: ("32",) / ("32", "06") / ("32", "06", "120") -> posisi baris (np.ndarray terurut)
+HIER_COLUMNS = ["kode_prov", "kode_kab", "kode_kec"]
+code_index: Dict[Tuple[str, ...], np.ndarray] = {}
+EMPTY_ROWS = np.empty(0, dtype=np.intp)
+# Rollup level 1/2/3: penanda baris pertama tiap grup prov / prov+kab / prov+kab+kec (bool per baris)
+group_first: Dict[int, np.ndarray] = {}
+
+# Kolom per level autocomplete; "depth" = jumlah kode induk (prov/kab/kec) yang wajar dikirim untuk level tsb
+SUGGEST_CONFIG = {
+    "prov":      {"code": "kode_prov", "name": "nama_prov", "search": "_search_prov", "depth": 0},
+    "kabupaten": {"code": "kode_kab",  "name": "kab_nama",  "search": "_search_kab",  "depth": 1},
+    "kecamatan": {"code": "kode_kec",  "name": "kec_nama",  "search": "_search_kec",  "depth": 2},
+    "desa":      {"code": "kode_desa", "name": "desa_nama", "search": "_search_desa", "depth": 3},
+}
+SUGGEST_LIMIT = 20
+# Materialized view saran tanpa query: (level, *kode induk) -> bytes JSON 20 teratas (terurut kode)
+suggest_views: Dict[Tuple[str, ...], bytes] = {}
 
 # ==========================================
 # 2. DATA LOADING
 # ==========================================
+def compact_strings(arr: pa.Array) -> pa.Array:
+    """Cast large_string (offset int64) -> string (offset int32): satu buffer UTF-8 + offset int32 per kolom."""
+    if isinstance(arr, pa.DictionaryArray):
+        return pa.DictionaryArray.from_arrays(arr.indices, compact_strings(arr.dictionary))
+    return arr.cast(pa.string()) if pa.types.is_large_string(arr.type) else arr
+
+def read_master_csv() -> pd.DataFrame:
+    """Baca master.csv & normalisasi: kode di-zfill, kolom pencarian huruf kecil."""
+    logger.info(f"Memuat data dari {DATA_PATH}...")
+    df = pd.read_csv(DATA_PATH, dtype=str).fillna("")
+
+    df["kode_prov"] = df["kode_prov"].str.strip().str.zfill(2)
+    df["kode_kab"] = df["kode_kab"].str.strip().str.zfill(2)
+    df["kode_kec"] = df["kode_kec"].str.strip().str.zfill(3)
+    df["kode_desa"] = df["kode_desa"].str.strip().str.zfill(3)
+
+    # Prov/kab/kec berkardinalitas rendah (~38/~500/~7rb nilai unik) -> categorical (dictionary-encoded).
+    # Desa hampir unik per baris, jadi tetap string biasa.
+    df["_search_prov"] = df["nama_prov"].str.lower().astype("category")
+    df["_search_kab"] = df["kab_nama"].str.lower().astype("category")
+    df["_search_kec"] = df["kec_nama"].str.lower().astype("category")
+    df["_search_desa"] = df["desa_nama"].str.lower()
+    return df
+
+def master_table(df: pd.DataFrame) -> pa.Table:
+    """DataFrame -> pa.Table satu chunk dengan string offset int32 (siap ditulis/di-scan tanpa konversi lagi)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return pa.table({name: compact_strings(table.column(name).combine_chunks()) for name in table.column_names})
+
+def arrow_cache_signature() -> Dict[bytes, bytes]:
+    """Versi format cache + identitas CSV sumber (ukuran & mtime ns), disimpan di metadata schema master.arrow."""
+    st = os.stat(DATA_PATH)
+    return {
+        b"cache_version": ARROW_CACHE_VERSION.encode(),
+        b"csv_size": str(st.st_size).encode(),
+        b"csv_mtime_ns": str(st.st_mtime_ns).encode(),
+    }
+
+def write_arrow_cache(table: pa.Table, signature: Dict[bytes, bytes]) -> None:
+    """Tulis ke file sementara lalu os.replace (atomik): worker lain tidak pernah membaca file setengah jadi."""
+    tmp_path = f"{ARROW_CACHE_PATH}.{os.getpid()}.tmp"
+    schema = table.schema.with_metadata(signature)
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        writer.write_table(table.replace_schema_metadata(signature))
+    os.replace(tmp_path, ARROW_CACHE_PATH)
+
+def open_arrow_cache(signature: Dict[bytes, bytes]) -> Optional[pa.Table]:
+    """Buka cache Arrow via mmap (zero-copy); None jika belum ada, rusak, atau dibuat dari CSV/format lain."""
+    if not os.path.exists(ARROW_CACHE_PATH): return None
+    try:
+        reader = pa.ipc.open_file(pa.memory_map(ARROW_CACHE_PATH))
+    except (OSError, pa.ArrowInvalid) as e:
+        logger.warning(f"⚠️ Cache {ARROW_CACHE_PATH} tidak bisa dibaca ({e}); dibangun ulang dari {DATA_PATH}.")
+        return None
+    metadata = reader.schema.metadata or {}
+    # Cocokkan isi metadata, bukan urutan mtime: CSV lama hasil cp -p / rsync -t / unzip tetap terdeteksi
+    if any(metadata.get(key) != value for key, value in signature.items()) or not set(ARROW_COLUMNS) <= set(reader.schema.names):
+        logger.info(f"Cache {ARROW_CACHE_PATH} tidak cocok dengan {DATA_PATH} / versi format; dibangun ulang.")
+        return None
+    logger.info(f"Memuat data dari {ARROW_CACHE_PATH} (mmap)...")
+    return reader.read_all()
+
+def single_chunk(col: pa.ChunkedArray) -> pa.Array:
+    # combine_chunks() selalu menyalin; untuk satu chunk ambil langsung agar tetap menunjuk ke mmap
+    return col.chunk(0) if col.num_chunks == 1 else col.combine_chunks()
+
+def suggestions_json(pairs: pa.Table, col_code: str, col_name: str) -> bytes:
+    """Pasangan (kode, nama) unik -> bytes JSON [{"kode", "nama"}] untuk SUGGEST_LIMIT kode teratas."""
+    # use_threads=False: hasil group_by berurutan kemunculan pertama, sort_by stabil untuk kode kembar
+    distinct = pairs.group_by([col_code, col_name], use_threads=False).aggregate([])
+    top = distinct.sort_by(col_code).slice(0, SUGGEST_LIMIT)
+    return orjson.dumps([{"kode": kode, "nama": nama} for kode, nama in zip(top[col_code].to_pylist(), top[col_name].to_pylist())])
+
+def build_suggest_views(table: pa.Table) -> Dict[Tuple[str, ...], bytes]:
+    """Precompute saran tanpa query per level & kode induk lengkap (satu sort per level, tanpa groupby per grup)."""
+    views: Dict[Tuple[str, ...], bytes] = {}
+    dump = lambda items: bytes(memoryview(orjson.dumps(items)))  # orjson menyisakan buffer >= 1 KiB; salin ke ukuran pas
+    for level, cfg in SUGGEST_CONFIG.items():
+        col_code, col_name, parents = cfg["code"], cfg["name"], HIER_COLUMNS[:cfg["depth"]]
+        # group_by tanpa thread = urutan kemunculan pertama (seperti drop_duplicates), sort_by stabil
+        distinct = table.select(parents + [col_code, col_name]).group_by(parents + [col_code, col_name], use_threads=False).aggregate([])
+        distinct = distinct.sort_by([(col, "ascending") for col in parents + [col_code]])
+        # Grup berurutan setelah sort -> dibaca per batch, hanya item satu grup yang hidup sebagai objek Python
+        key, items = None, []
+        for batch in distinct.to_batches(max_chunksize=4096):
+            for *parent, kode, nama in zip(*(batch.column(i).to_pylist() for i in range(batch.num_columns))):
+                if key != (level, *parent):
+                    if key: views[key] = dump(items)
+                    key, items = (level, *parent), []
+                if len(items) < SUGGEST_LIMIT: items.append({"kode": kode, "nama": nama})
+        if key: views[key] = dump(items)
+    return views
+
+def per_value(arr: pa.Array, fn: Callable, dtype) -> np.ndarray:
+    """Hitung fn sekali per nilai unik kolom lalu sebar ke semua baris lewat indeks dictionary."""
+    encoded = arr if isinstance(arr, pa.DictionaryArray) else arr.dictionary_encode()
+    values = np.array([fn(val) for val in encoded.dictionary.to_pylist()], dtype=dtype)
+    return values[encoded.indices.to_numpy()]
+
+def first_char_codes(arr: pa.Array) -> np.ndarray:
+    """Codepoint karakter pertama tiap baris (0 untuk string kosong) sebagai uint32."""
+    # Kolom non-dictionary dipotong dulu ke 1 karakter: nilai unik tinggal puluhan, bukan per baris
+    if not isinstance(arr, pa.DictionaryArray): arr = pc.utf8_slice_codeunits(arr, 0, 1)
+    return per_value(arr, lambda val: ord(val[0]) if val else 0, np.uint32)
+
+def string_chars(arr: pa.Array) -> frozenset:
+    """Himpunan karakter yang muncul di kolom string, dibaca dari buffer UTF-8 (tanpa list string Python)."""
+    if isinstance(arr, pa.DictionaryArray): arr = arr.dictionary
+    if len(arr) == 0: return frozenset()
+    _, offsets, data = arr.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int64 if pa.types.is_large_string(arr.type) else np.int32)
+    start, end = offsets[arr.offset], offsets[arr.offset + len(arr)]
+    return frozenset(data.to_pybytes()[start:end].decode("utf-8"))
+
+def build_code_index(n_rows: int) -> Tuple[Dict[Tuple[str, ...], np.ndarray], Dict[int, np.ndarray]]:
+    """code_index & group_first untuk prefix kode prov / prov+kab / prov+kab+kec, langsung dari kolom Arrow.
+
+    Kunci grup = gabungan indeks dictionary tiap kolom kode (int64, 21 bit per level); argsort stabil
+    membuat posisi baris dalam tiap grup tetap terurut naik.
+    """
+    index: Dict[Tuple[str, ...], np.ndarray] = {}
+    first: Dict[int, np.ndarray] = {}
+    encoded = [arrow_cols[col].dictionary_encode() for col in HIER_COLUMNS]
+    key = np.zeros(n_rows, dtype=np.int64)
+    for depth, codes in enumerate(encoded, 1):
+        key = (key << 21) | codes.indices.to_numpy().astype(np.int64)
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        starts = np.flatnonzero(np.r_[True, sorted_key[1:] != sorted_key[:-1]])
+        first_rows = order[starts]
+        first[depth] = np.zeros(n_rows, dtype=bool)
+        first[depth][first_rows] = True
+        names = [enc.dictionary.to_pylist() for enc in encoded[:depth]]
+        key_idx = zip(*(enc.indices.to_numpy()[first_rows].tolist() for enc in encoded[:depth]))
+        for rows, idx in zip(np.split(order, starts[1:]), key_idx):
+            index[tuple(values[i] for values, i in zip(names, idx))] = rows
+    return index, first
+
 def load_data() -> None:
-    global df_master
+    global master, arrow_cols, code_ints, code_index, group_first, first_chars, col_chars, suggest_views
     
-    if os.path.exists(LOGO_FILENAME):
+    if os.path.basename(LOGO_FILENAME) in static_assets:
         logger.info(f"✅ File logo '{LOGO_FILENAME}' ditemukan.")
     else:
         logger.warning(f"⚠️ File logo '{LOGO_FILENAME}' TIDAK ditemukan. Pastikan file ada di folder yang sama.")
 
     try:
-        logger.info(f"Memuat data dari {DATA_PATH}...")
-        df = pd.read_csv(DATA_PATH, dtype=str).fillna("")
-        
-        df["kode_prov"] = df["kode_prov"].str.strip().str.zfill(2)
-        df["kode_kab"] = df["kode_kab"].str.strip().str.zfill(2)
-        df["kode_kec"] = df["kode_kec"].str.strip().str.zfill(3)
-        df["kode_desa"] = df["kode_desa"].str.strip().str.zfill(3)
-        
-        df["_search_prov"] = df["nama_prov"].str.lower()
-        df["_search_kab"] = df["kab_nama"].str.lower()
-        df["_search_kec"] = df["kec_nama"].str.lower()
-        df["_search_desa"] = df["desa_nama"].str.lower()
-        
-        df_master = df
-        logger.info(f"✅ Data siap: {len(df_master)} baris.")
+        signature = arrow_cache_signature()
+        table = open_arrow_cache(signature)
+        if table is None:
+            # CSV hanya diparse oleh proses pertama (atau saat CSV/format berubah); worker berikutnya langsung mmap
+            table = master_table(read_master_csv())
+            try:
+                write_arrow_cache(table, signature)
+                # Buka ulang via mmap agar buffer kolom menunjuk ke page cache bersama, bukan heap proses ini
+                cached = open_arrow_cache(signature)
+                if cached is not None: table = cached
+            except OSError as e:
+                logger.warning(f"⚠️ Cache {ARROW_CACHE_PATH} tidak bisa ditulis ({e}); data hanya di memori proses ini.")
+
+        # Struktur turunan dibangun langsung dari kolom Arrow (tanpa to_pandas): heap tiap worker
+        # hanya berisi indeks kecil ini, data master sendiri tetap di page cache mmap bersama
+        arrow_cols = {name: single_chunk(table.column(name)) for name in ARROW_COLUMNS}
+
+        code_ints = {
+            col: per_value(arrow_cols[col], lambda val: int(val) if val.isascii() and val.isdigit() else CODE_NA, np.uint16)
+            for col in CODE_LEN
+        }
+        first_chars = {col: first_char_codes(arrow_cols[col]) for col in SEARCH_COLUMNS}
+        col_chars = {col: string_chars(arrow_cols[col]) for col in SEARCH_COLUMNS}
+
+        code_index, group_first = build_code_index(table.num_rows)
+        suggest_views = build_suggest_views(table)
+        # Buffer sementara pembangunan indeks dikembalikan ke OS (mimalloc/jemalloc menahannya secara default)
+        pa.default_memory_pool().release_unused()
+
+        master = table
+        logger.info(f"✅ Data siap: {master.num_rows} baris.")
     except Exception as e:
         logger.error(f"❌ Gagal memuat data: {str(e)}")
-        df_master = pd.DataFrame()
+        master = pa.table({})
+        arrow_cols, code_ints = {}, {}
+        first_chars, col_chars = {}, {}
+        code_index, group_first, suggest_views = {}, {}, {}
 
-load_data()
+    # Hasil ber-cache dihitung dari data lama -> buang saat data dimuat ulang
+    get_cached_suggestions.cache_clear()
+    search_rows.cache_clear()
 
 # ==========================================
 # 3. LOGIKA BISNIS
 # ==========================================
-def highlight_text(text: str, query: str) -> str:
-    if not query or len(query) < 2: return text
-    safe_query = re.escape(query)
-    return re.sub(f"({safe_query})", r'<mark class="bg-yellow-200 dark:bg-yellow-900/60 dark:text-yellow-100 rounded-sm px-0.5">\1</mark>', text, flags=re.IGNORECASE)
+def hierarchy_lookup(codes: List[str]) -> Tuple[Optional[np.ndarray], int]:
+    """Ambil baris untuk prefix kode berurutan (prov -> kab -> kec) lewat code_index.
+
+    Mengembalikan (posisi baris, jumlah level terpakai). Posisi None berarti
+    tidak ada kode prov, sehingga tidak ada prefix yang bisa dipakai.
+    """
+    depth = 0
+    while depth < len(codes) and codes[depth]: depth += 1
+    if depth == 0: return None, 0
+    return code_index.get(tuple(codes[:depth]), EMPTY_ROWS), depth
+
+def column(col: str, rows: Optional[np.ndarray] = None) -> pa.Array:
+    """Kolom arrow penuh, atau hanya baris kandidat `rows` jika diberikan."""
+    arr = arrow_cols[col]
+    return arr if rows is None else arr.take(rows)
+
+def code_mask(col: str, val: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Kode lengkap -> satu perbandingan uint16 vectorized; nilai lain tetap dibandingkan sebagai string."""
+    if val.isascii() and val.isdigit() and len(val) == CODE_LEN[col]:
+        codes = code_ints[col] if rows is None else code_ints[col][rows]
+        return codes == int(val)
+    return pc.equal(column(col, rows), val).to_numpy(zero_copy_only=False)
+
+def match_search(col: str, op, value: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Jalankan kernel string `op` pada kolom pencarian.
+
+    Untuk kolom dictionary-encoded, kernel hanya dijalankan pada nilai unik
+    (dictionary) lalu hasilnya di-gather ke tiap baris lewat indeks integer.
+    """
+    if not col_chars[col].issuperset(value):
+        # Ada karakter query yang tidak pernah muncul di kolom ini -> pasti kosong, lewati scan
+        return np.zeros(master.num_rows if rows is None else len(rows), dtype=bool)
+    arr = column(col, rows)
+    if isinstance(arr, pa.DictionaryArray):
+        return op(arr.dictionary, value).to_numpy(zero_copy_only=False)[arr.indices.to_numpy()]
+    return op(arr, value).to_numpy(zero_copy_only=False)
+
+def first_char_mask(col: str, char: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Prefix 1 karakter = perbandingan integer pada codepoint karakter pertama (tanpa scan string)."""
+    chars = first_chars[col] if rows is None else first_chars[col][rows]
+    return chars == ord(char)
+
+def filter_rows(mask: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Posisi baris master yang lolos mask; jika `rows` diberikan, mask relatif terhadap kandidat tersebut."""
+    hits = np.flatnonzero(mask)
+    return hits if rows is None else rows[hits]
+
+MaskStep = Callable[[Optional[np.ndarray]], np.ndarray]
+
+def narrow_rows(rows: Optional[np.ndarray], steps: List[MaskStep]) -> Optional[np.ndarray]:
+    """Jalankan filter satu per satu (fused pipeline): tiap langkah hanya memindai baris yang lolos
+    langkah sebelumnya, dan berhenti begitu kandidat habis. None = tidak ada filter sama sekali."""
+    for step in steps:
+        rows = filter_rows(step(rows), rows)
+        if len(rows) == 0: break
+    return rows
+
+def rollup_rows(rows: np.ndarray, level: int) -> np.ndarray:
+    """Baris pertama tiap grup prov[/kab[/kec]] di antara `rows`, urutan asli dipertahankan.
+
+    Filter yang aktif saat rollup hanya menyentuh kolom level <= `level` (nilainya seragam dalam
+    satu grup), jadi sebuah grup lolos utuh atau tidak sama sekali -> cukup gather penanda
+    baris pertama grup yang sudah dihitung saat load.
+    """
+    return rows[group_first[level][rows]]
+
+def take_rows(rows: Optional[np.ndarray], columns: List[str]) -> pa.Table:
+    """Materialisasi kolom `columns` untuk baris terpilih (sekali take di akhir); None = seluruh baris."""
+    table = master.select(columns)
+    return table if rows is None else table.take(rows)
+
+# Jenis nilai filter /search per level; kombinasinya (4^4) menentukan rencana filter yang dipakai
+EMPTY, CODE, EXACT_NAME, SUBSTR_NAME = range(4)
+SEARCH_FILTERS = [
+    ("kode_prov", "_search_prov"), ("kode_kab", "_search_kab"),
+    ("kode_kec", "_search_kec"), ("kode_desa", "_search_desa"),
+]
+
+def classify_filter(val: str, is_exact: bool, col_code: str) -> int:
+    if not val: return EMPTY
+    if val.isdigit() and len(val) == CODE_LEN[col_code]: return CODE
+    return EXACT_NAME if is_exact else SUBSTR_NAME
+
+@lru_cache(maxsize=None)
+def search_plan(kinds: Tuple[int, ...]) -> Tuple[int, Tuple[Tuple[int, Callable], ...]]:
+    """Rencana filter terspesialisasi untuk satu kombinasi jenis filter (dibangun sekali, lalu dipakai ulang).
+
+    Mengembalikan (jumlah level kode awal yang diambil dari code_index, langkah filter berurutan).
+    Tiap langkah = (indeks level, fungsi(nilai, rows) -> mask); langkah kode didahulukan karena murah.
+    """
+    depth = 0
+    while depth < len(HIER_COLUMNS) and kinds[depth] == CODE: depth += 1
+    steps = []
+    for level in sorted(range(depth, len(kinds)), key=lambda i: kinds[i] != CODE):
+        col_code, col_search = SEARCH_FILTERS[level]
+        kind = kinds[level]
+        if kind == CODE: steps.append((level, partial(code_mask, col_code)))
+        elif kind == EXACT_NAME: steps.append((level, partial(match_search, col_search, pc.equal)))
+        elif kind == SUBSTR_NAME: steps.append((level, partial(match_search, col_search, pc.match_substring)))
+    return depth, tuple(steps)
+
+MARK_HEAD = '<mark class="bg-yellow-200 dark:bg-yellow-900/60 dark:text-yellow-100 rounded-sm px-0.5">'
+MARK_TAIL = "</mark>"
+HIGHLIGHT_REPL = MARK_HEAD + r"\1" + MARK_TAIL
+
+@lru_cache(maxsize=256)
+def highlight_pattern(query: str) -> re.Pattern:
+    return re.compile(f"({re.escape(query)})", re.IGNORECASE)
+
+def highlight_text(text: str, needle: str) -> str:
+    """Bungkus tiap kemunculan `needle` (huruf kecil) dengan <mark> lewat str.find, casing teks asli tetap."""
+    haystack = text.lower()
+    if len(haystack) != len(text):
+        # lower() mengubah panjang (mis. 'İ') -> posisi tidak sejajar dengan teks asli, pakai regex
+        return highlight_pattern(needle).sub(HIGHLIGHT_REPL, text)
+    pos = haystack.find(needle)
+    if pos < 0: return text
+    parts, start = [], 0
+    while pos >= 0:
+        end = pos + len(needle)
+        parts += (text[start:pos], MARK_HEAD, text[pos:end], MARK_TAIL)
+        start = end
+        pos = haystack.find(needle, start)
+    parts.append(text[start:])
+    return "".join(parts)
+
+def highlight_array(arr: pa.Array, query: str) -> pa.Array:
+    """Highlight query (literal, bukan regex) pada satu kolom, dihitung sekali per nilai unik."""
+    if not query or len(query) < 2: return arr
+    needle = query.lower()
+    # Nama prov/kab/kec berulang di banyak baris -> dictionary_encode, highlight nilai unik, gather lagi
+    encoded = arr.dictionary_encode()
+    highlighted = pa.array([highlight_text(text, needle) for text in encoded.dictionary.to_pylist()], pa.string())
+    return highlighted.take(encoded.indices)
+
+def build_col_html(arr: pa.Array, prefix: str, suffix: str) -> pa.Array:
+    """Bungkus satu kolom menjadi HTML sel via konkatenasi string vectorized (kernel arrow)."""
+    return pc.binary_join_element_wise(prefix, arr, suffix, "")
 
 @lru_cache(maxsize=1024) 
-def get_cached_suggestions(level: str, query: str, prov: str, kab: str, kec: str) -> List[Dict[str, str]]:
-    if df_master.empty: return []
-    subset = df_master
-    
-    if prov: subset = subset[subset["kode_prov"] == prov]
-    if kab: subset = subset[subset["kode_kab"] == kab]
-    if kec: subset = subset[subset["kode_kec"] == kec]
-    if subset.empty: return []
-
-    config = {
-        "prov":      {"code": "kode_prov", "name": "nama_prov", "search": "_search_prov"},
-        "kabupaten": {"code": "kode_kab",  "name": "kab_nama",  "search": "_search_kab"},
-        "kecamatan": {"code": "kode_kec",  "name": "kec_nama",  "search": "_search_kec"},
-        "desa":      {"code": "kode_desa", "name": "desa_nama", "search": "_search_desa"},
-    }
-    
-    cfg = config.get(level)
-    if not cfg: return []
+def get_cached_suggestions(level: str, query: str, prov: str, kab: str, kec: str) -> bytes:
+    """Saran autocomplete sebagai bytes JSON siap kirim: [{"kode": ..., "nama": ...}, ...]."""
+    if master.num_rows == 0: return b"[]"
+
+    cfg = SUGGEST_CONFIG.get(level)
+    if not cfg: return b"[]"
 
     q = query.strip().lower()
     col_code = cfg["code"]
     col_name = cfg["name"]
-    
+
+    codes = [prov, kab, kec]
+    if not q and all(codes[:cfg["depth"]]) and not any(codes[cfg["depth"]:]):
+        # Dropdown awal (tanpa ketikan) dengan kode induk lengkap -> langsung dari materialized view
+        return suggest_views.get((level, *codes[:cfg["depth"]]), b"[]")
+
+    rows, depth = hierarchy_lookup(codes)
+    steps: List[MaskStep] = [
+        partial(code_mask, col, val)
+        for col, val in zip(HIER_COLUMNS[depth:], codes[depth:]) if val
+    ]
     if q:
         if q.isdigit():
-            subset = subset[subset[col_code].str.contains(q, na=False)]
+            steps.append(lambda rows: pc.match_substring(column(col_code, rows), q).to_numpy(zero_copy_only=False))
         else:
             col_search = cfg["search"]
-            if len(q) == 1: subset = subset[subset[col_search].str.startswith(q, na=False)]
-            else: subset = subset[subset[col_search].str.contains(q, na=False)]
-    
-    return subset[[col_code, col_name]].drop_duplicates().sort_values(col_code).head(20).to_dict(orient="records")
+            if len(q) == 1: steps.append(partial(first_char_mask, col_search, q))
+            else: steps.append(partial(match_search, col_search, pc.match_substring, q))
+
+    return suggestions_json(take_rows(narrow_rows(rows, steps), [col_code, col_name]), col_code, col_name)
 
 # ==========================================
 # 4. API ENDPOINTS
 # ==========================================
+# Fragmen HTML statis: di-encode ke UTF-8 sekali saat import, bukan per request
+DB_NOT_LOADED_HTML = "<div class='p-6 text-center text-red-600 font-bold bg-red-50 rounded-lg'>❌ Database belum dimuat.</div>".encode("utf-8")
 
-@app.get("/search", response_class=HTMLResponse)
-async def api_search_table(
-    response: Response,
-    prov: str = "", prov_exact: bool = False,
-    kab: str = "", kab_exact: bool = False,
-    kec: str = "", kec_exact: bool = False,
-    desa: str = "", desa_exact: bool = False,
-    expand: bool = False
-):
-    response.headers["Cache-Control"] = "public, max-age=3600"
-
-    if df_master.empty:
-        return "<div class='p-6 text-center text-red-600 font-bold bg-red-50 rounded-lg'>❌ Database belum dimuat.</div>"
-
-    # EMPTY STATE GUIDE
-    if not any([prov, kab, kec, desa]):
-        return """
+EMPTY_STATE_HTML = """
         <div class="flex flex-col items-center justify-center py-20 text-center animate-fade-in">
             <div class="bg-blue-50 dark:bg-slate-800/50 p-5 rounded-full mb-6 shadow-sm ring-1 ring-blue-100 dark:ring-slate-700 transition-all duration-500">
                 <svg class="w-12 h-12 text-blue-500 dark:text-blue-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -170,30 +597,96 @@ async def api_search_table(
                 pada kolom di atas untuk menampilkan Kode Wilayah.
             </p>
         </div>
-        """
+        """.encode("utf-8")
 
-    subset = df_master.copy()
-    
-    def apply_filter(df, val, is_exact, col_code, col_search, code_len):
-        if not val: return df
-        val = val[:50] 
-        if val.isdigit() and len(val) == code_len: return df[df[col_code] == val]
-        val_lower = val.lower()
-        if is_exact: return df[df[col_search] == val_lower]
-        else: return df[df[col_search].str.contains(val_lower, na=False)]
-
-    subset = apply_filter(subset, prov, prov_exact, "kode_prov", "_search_prov", 2)
-    subset = apply_filter(subset, kab, kab_exact, "kode_kab", "_search_kab", 2)
-    subset = apply_filter(subset, kec, kec_exact, "kode_kec", "_search_kec", 3)
-    subset = apply_filter(subset, desa, desa_exact, "kode_desa", "_search_desa", 3)
-
-    if subset.empty:
-        return """
+NOT_FOUND_HTML = """
         <div class="flex flex-col items-center justify-center py-16 text-slate-400 dark:text-slate-500 animate-fade-in">
             <svg class="w-16 h-16 mb-4 opacity-25" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="1.5" d="M9.172 16.172a4 4 0 015.656 0M9 10h.01M15 10h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>
             <p class="text-lg font-medium">Data tidak ditemukan.</p>
         </div>
-        """
+        """.encode("utf-8")
+
+# Template tabel hasil: potongan HTML konstan di level modul, per request hanya konkatenasi nilai
+# --- UI FIXES: min-w, no-wrap for codes ---
+NAME_COLUMNS = ["nama_prov", "kab_nama", "kec_nama", "desa_nama"]
+CODE_COLUMNS = ["kode_prov", "kode_kab", "kode_kec", "kode_desa"]
+
+TD_NAME_HEAD = [
+    '<td class="px-3 lg:px-4 py-3 text-sm font-semibold text-slate-700 dark:text-slate-200 align-middle min-w-[140px]" data-label="Provinsi">',
+    '<td class="px-3 lg:px-4 py-3 text-sm text-slate-600 dark:text-slate-300 align-middle min-w-[140px]" data-label="Kab/Kota">',
+    '<td class="px-3 lg:px-4 py-3 text-sm text-slate-600 dark:text-slate-300 align-middle min-w-[140px]" data-label="Kecamatan">',
+    '<td class="px-3 lg:px-4 py-3 text-sm text-slate-600 dark:text-slate-300 align-middle min-w-[140px]" data-label="Desa">',
+]
+TD_NAME_TAIL = '</td>'
+
+KODE_BADGE = '<span class="inline-block px-2 py-0.5 font-mono text-xs font-bold text-blue-700 dark:text-blue-300 bg-blue-50 dark:bg-blue-900/40 rounded border border-blue-100 dark:border-blue-800/50">'
+TD_KODE_HEAD = [
+    f'<td class="px-3 lg:px-4 py-3 text-center align-middle whitespace-nowrap" data-label="{label}">{KODE_BADGE}'
+    for label in ["Kode Prov", "Kode Kab", "Kode Kec", "Kode Desa"]
+]
+TD_KODE_TAIL = '</span></td>'
+
+TD_AKSI_HEAD = (
+    '<td class="px-3 lg:px-4 py-3 text-center align-middle whitespace-nowrap" data-label="Aksi">'
+    '<button class="btn-copy group/btn relative inline-flex items-center justify-center p-2 text-slate-400 dark:text-slate-500 hover:text-blue-600 dark:hover:text-blue-400 hover:bg-white dark:hover:bg-slate-700 border border-transparent hover:border-blue-100 dark:hover:border-slate-600 hover:shadow-sm rounded-lg transition-all active:scale-95" '
+    'data-prov="'
+)
+TD_AKSI_TAIL = (
+    '" title="Salin Kode">'
+    '<svg class="w-5 h-5 transition-transform group-hover/btn:scale-110" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 5H6a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2v-1M8 5a2 2 0 002 2h2a2 2 0 002-2M8 5a2 2 0 012-2h2a2 2 0 012 2m0 0h2a2 2 0 012 2v3m2 4H10m0 0l3-3m-3 3l3 3"></path></svg>'
+    '</button></td>'
+)
+
+TR_HEAD = '<tr class="bg-white dark:bg-slate-800 hover:bg-blue-50/40 dark:hover:bg-slate-700/50 border-b border-slate-100 dark:border-slate-700/60 last:border-0 transition-colors duration-150 group relative">'
+TR_TAIL = '</tr>'
+
+TH_NAME = [
+    f'<th class="px-3 lg:px-4 py-4 tracking-wider whitespace-nowrap text-left">{label}</th>'
+    for label in ["PROVINSI", "KAB/KOTA", "KECAMATAN", "DESA"]
+]
+TH_KODE = [
+    f'<th class="px-3 lg:px-4 py-4 text-center whitespace-nowrap">{label}</th>'
+    for label in ["KODE PROV", "KODE KAB", "KODE KEC", "KODE DESA"]
+]
+TH_AKSI = '<th class="px-3 lg:px-4 py-4 text-center whitespace-nowrap">AKSI</th>'
+HEADER_HTML = {level: "".join(TH_NAME[:level] + TH_KODE[:level]) + TH_AKSI for level in range(1, 5)}
+
+def html_response(body: bytes, cache_control: str = "public, max-age=3600") -> Response:
+    """Response baru per request (GZipMiddleware memodifikasi header in-place), body bytes dipakai bersama."""
+    return Response(body, media_type="text/html", headers={"Cache-Control": cache_control})
+
+SEARCH_LIMIT = 100  # baris yang ditampilkan di tabel hasil
+
+class SearchResult(NamedTuple):
+    rows: np.ndarray  # posisi baris yang ditampilkan (maks SEARCH_LIMIT)
+    total_found: int
+    view_level: int
+
+# Cache hanya hasil filter (<= SEARCH_LIMIT indeks per entri), bukan body HTML ratusan KB:
+# key berisi teks bebas dari klien, jadi ukuran per entri harus kecil agar memori worker tetap terbatas
+@lru_cache(maxsize=2048)
+def search_rows(
+    prov: str, prov_exact: bool,
+    kab: str, kab_exact: bool,
+    kec: str, kec_exact: bool,
+    desa: str, desa_exact: bool,
+    expand: bool
+) -> Optional[SearchResult]:
+    """Filter /search -> baris yang ditampilkan; None jika tidak ada yang cocok."""
+    values = [val[:50] for val in (prov, kab, kec, desa)]
+    kinds = tuple(
+        classify_filter(val, is_exact, col_code)
+        for val, is_exact, (col_code, _) in zip(values, (prov_exact, kab_exact, kec_exact, desa_exact), SEARCH_FILTERS)
+    )
+    values = [val if kind == CODE else val.lower() for val, kind in zip(values, kinds)]
+
+    # Prefix kode lengkap (mis. prov=32, kab=06) langsung dari inverted index, sisanya difilter pada kandidat
+    depth, steps = search_plan(kinds)
+    rows = code_index.get(tuple(values[:depth]), EMPTY_ROWS) if depth else None
+    rows = narrow_rows(rows, [partial(step, values[level]) for level, step in steps])
+
+    if rows is None: rows = np.arange(master.num_rows)
+    if len(rows) == 0: return None
 
     view_level = 4 
     if not desa:
@@ -204,58 +697,43 @@ async def api_search_table(
 
     if expand and view_level < 4: view_level += 1
 
-    if view_level == 1: subset = subset.drop_duplicates(subset=['kode_prov'])
-    elif view_level == 2: subset = subset.drop_duplicates(subset=['kode_prov', 'kode_kab'])
-    elif view_level == 3: subset = subset.drop_duplicates(subset=['kode_prov', 'kode_kab', 'kode_kec'])
-    
-    LIMIT = 100
-    total_found = len(subset)
-    subset = subset.head(LIMIT)
-    rows_html = []
-
-    for _, row in subset.iterrows():
-        k_prov, k_kab = row['kode_prov'], row['kode_kab']
-        k_kec, k_desa = row['kode_kec'], row['kode_desa']
-        
-        n_prov = highlight_text(row['nama_prov'], prov if not prov_exact else "")
-        n_kab = highlight_text(row['kab_nama'], kab if not kab_exact else "")
-        n_kec = highlight_text(row['kec_nama'], kec if not kec_exact else "")
-        n_desa = highlight_text(row['desa_nama'], desa if not desa_exact else "")
-
-        # --- UI FIXES: min-w, no-wrap for codes ---
-        td_content = f'<td class="px-3 lg:px-4 py-3 text-sm font-semibold text-slate-700 dark:text-slate-200 align-middle min-w-[140px]" data-label="Provinsi">{n_prov}</td>'
-        if view_level >= 2: td_content += f'<td class="px-3 lg:px-4 py-3 text-sm text-slate-600 dark:text-slate-300 align-middle min-w-[140px]" data-label="Kab/Kota">{n_kab}</td>'
-        if view_level >= 3: td_content += f'<td class="px-3 lg:px-4 py-3 text-sm text-slate-600 dark:text-slate-300 align-middle min-w-[140px]" data-label="Kecamatan">{n_kec}</td>'
-        if view_level >= 4: td_content += f'<td class="px-3 lg:px-4 py-3 text-sm text-slate-600 dark:text-slate-300 align-middle min-w-[140px]" data-label="Desa">{n_desa}</td>'
-
-        td_content += f'<td class="px-3 lg:px-4 py-3 text-center align-middle whitespace-nowrap" data-label="Kode Prov"><span class="inline-block px-2 py-0.5 font-mono text-xs font-bold text-blue-700 dark:text-blue-300 bg-blue-50 dark:bg-blue-900/40 rounded border border-blue-100 dark:border-blue-800/50">{k_prov}</span></td>'
-        if view_level >= 2: td_content += f'<td class="px-3 lg:px-4 py-3 text-center align-middle whitespace-nowrap" data-label="Kode Kab"><span class="inline-block px-2 py-0.5 font-mono text-xs font-bold text-blue-700 dark:text-blue-300 bg-blue-50 dark:bg-blue-900/40 rounded border border-blue-100 dark:border-blue-800/50">{k_kab}</span></td>'
-        if view_level >= 3: td_content += f'<td class="px-3 lg:px-4 py-3 text-center align-middle whitespace-nowrap" data-label="Kode Kec"><span class="inline-block px-2 py-0.5 font-mono text-xs font-bold text-blue-700 dark:text-blue-300 bg-blue-50 dark:bg-blue-900/40 rounded border border-blue-100 dark:border-blue-800/50">{k_kec}</span></td>'
-        if view_level >= 4: td_content += f'<td class="px-3 lg:px-4 py-3 text-center align-middle whitespace-nowrap" data-label="Kode Desa"><span class="inline-block px-2 py-0.5 font-mono text-xs font-bold text-blue-700 dark:text-blue-300 bg-blue-50 dark:bg-blue-900/40 rounded border border-blue-100 dark:border-blue-800/50">{k_desa}</span></td>'
-
-        td_content += f"""
-            <td class="px-3 lg:px-4 py-3 text-center align-middle whitespace-nowrap" data-label="Aksi">
-                <button class="btn-copy group/btn relative inline-flex items-center justify-center p-2 text-slate-400 dark:text-slate-500 hover:text-blue-600 dark:hover:text-blue-400 hover:bg-white dark:hover:bg-slate-700 border border-transparent hover:border-blue-100 dark:hover:border-slate-600 hover:shadow-sm rounded-lg transition-all active:scale-95"
-                        data-prov="{k_prov}" data-kab="{k_kab if view_level >= 2 else ''}" data-kec="{k_kec if view_level >= 3 else ''}" data-desa="{k_desa if view_level >= 4 else ''}"
-                        title="Salin Kode">
-                    <svg class="w-5 h-5 transition-transform group-hover/btn:scale-110" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 5H6a2 2 0 00-2 2v12a2 2 0 002 2h10a2 2 0 002-2v-1M8 5a2 2 0 002 2h2a2 2 0 002-2M8 5a2 2 0 012-2h2a2 2 0 012 2m0 0h2a2 2 0 012 2v3m2 4H10m0 0l3-3m-3 3l3 3"></path></svg>
-                </button>
-            </td>
-        """
-        rows_html.append(f'<tr class="bg-white dark:bg-slate-800 hover:bg-blue-50/40 dark:hover:bg-slate-700/50 border-b border-slate-100 dark:border-slate-700/60 last:border-0 transition-colors duration-150 group relative">{td_content}</tr>')
-
-    header_html = '<th class="px-3 lg:px-4 py-4 tracking-wider whitespace-nowrap text-left">PROVINSI</th>'
-    if view_level >= 2: header_html += '<th class="px-3 lg:px-4 py-4 tracking-wider whitespace-nowrap text-left">KAB/KOTA</th>'
-    if view_level >= 3: header_html += '<th class="px-3 lg:px-4 py-4 tracking-wider whitespace-nowrap text-left">KECAMATAN</th>'
-    if view_level >= 4: header_html += '<th class="px-3 lg:px-4 py-4 tracking-wider whitespace-nowrap text-left">DESA</th>'
-    
-    header_html += '<th class="px-3 lg:px-4 py-4 text-center whitespace-nowrap">KODE PROV</th>'
-    if view_level >= 2: header_html += '<th class="px-3 lg:px-4 py-4 text-center whitespace-nowrap">KODE KAB</th>'
-    if view_level >= 3: header_html += '<th class="px-3 lg:px-4 py-4 text-center whitespace-nowrap">KODE KEC</th>'
-    if view_level >= 4: header_html += '<th class="px-3 lg:px-4 py-4 text-center whitespace-nowrap">KODE DESA</th>'
-    header_html += '<th class="px-3 lg:px-4 py-4 text-center whitespace-nowrap">AKSI</th>'
+    if view_level < 4: rows = rollup_rows(rows, view_level)
+    # copy(): jangan menahan array kandidat penuh (atau view code_index) di cache
+    return SearchResult(rows[:SEARCH_LIMIT].copy(), len(rows), view_level)
+
+def render_search_table(
+    prov: str, prov_exact: bool,
+    kab: str, kab_exact: bool,
+    kec: str, kec_exact: bool,
+    desa: str, desa_exact: bool,
+    expand: bool
+) -> bytes:
+    """Render tabel hasil pencarian menjadi bytes HTML dari hasil filter ber-cache (maks SEARCH_LIMIT baris)."""
+    result = search_rows(prov, prov_exact, kab, kab_exact, kec, kec_exact, desa, desa_exact, expand)
+    if result is None: return NOT_FOUND_HTML
+    total_found, view_level = result.total_found, result.view_level
+
+    # Hanya baris yang ditampilkan yang dimaterialisasi (pa.Table kecil, satu chunk)
+    subset = take_rows(result.rows, NAME_COLUMNS + CODE_COLUMNS).combine_chunks()
 
-    info_limit = f"<div class='px-4 py-3 text-xs font-medium text-center bg-blue-50/50 text-blue-800 dark:bg-slate-800 dark:text-slate-400 border-b border-blue-100 dark:border-slate-700'>Menampilkan <strong>{LIMIT}</strong> data teratas dari total <strong>{total_found}</strong> data ditemukan.</div>" if total_found > LIMIT else ""
+    # --- VECTORIZED ROW BUILDER (kolom demi kolom, tanpa iterrows) ---
+    queries = [(prov, prov_exact), (kab, kab_exact), (kec, kec_exact), (desa, desa_exact)]
+    cells = [
+        build_col_html(highlight_array(subset[col].chunk(0), query if not is_exact else ""), TD_NAME_HEAD[i], TD_NAME_TAIL)
+        for i, (col, (query, is_exact)) in enumerate(zip(NAME_COLUMNS[:view_level], queries))
+    ]
+    cells += [build_col_html(subset[col], TD_KODE_HEAD[i], TD_KODE_TAIL) for i, col in enumerate(CODE_COLUMNS[:view_level])]
+
+    code_attr = lambda col, level: subset[col] if view_level >= level else ""
+    cells.append(pc.binary_join_element_wise(
+        TD_AKSI_HEAD, subset["kode_prov"], '" data-kab="', code_attr("kode_kab", 2),
+        '" data-kec="', code_attr("kode_kec", 3), '" data-desa="', code_attr("kode_desa", 4), TD_AKSI_TAIL, ""
+    ))
+
+    rows_html = "".join(pc.binary_join_element_wise(TR_HEAD, *cells, TR_TAIL, "").to_pylist())
+    header_html = HEADER_HTML[view_level]
+
+    info_limit = f"<div class='px-4 py-3 text-xs font-medium text-center bg-blue-50/50 text-blue-800 dark:bg-slate-800 dark:text-slate-400 border-b border-blue-100 dark:border-slate-700'>Menampilkan <strong>{SEARCH_LIMIT}</strong> data teratas dari total <strong>{total_found}</strong> data ditemukan.</div>" if total_found > SEARCH_LIMIT else ""
 
     return f"""
     <div class="bg-white dark:bg-slate-800 rounded-xl shadow-lg border border-slate-200 dark:border-slate-700 overflow-hidden ring-1 ring-black/5 animate-fade-in">
@@ -265,22 +743,357 @@ async def api_search_table(
                 <thead class="text-xs font-bold text-slate-500 dark:text-slate-400 uppercase bg-slate-50/80 dark:bg-slate-900/50 border-b border-slate-200 dark:border-slate-700 sticky top-0 z-10 backdrop-blur-sm">
                     <tr>{header_html}</tr>
                 </thead>
-                <tbody class="divide-y divide-slate-100 dark:divide-slate-700">{"".join(rows_html)}</tbody>
+                <tbody class="divide-y divide-slate-100 dark:divide-slate-700">{rows_html}</tbody>
             </table>
         </div>
     </div>
-    """
+    """.encode("utf-8")
+
+@app.get("/search", response_class=HTMLResponse)
+async def api_search_table(
+    prov: str = "", prov_exact: bool = False,
+    kab: str = "", kab_exact: bool = False,
+    kec: str = "", kec_exact: bool = False,
+    desa: str = "", desa_exact: bool = False,
+    expand: bool = False
+):
+    if master.num_rows == 0:
+        return html_response(DB_NOT_LOADED_HTML, "no-store")
+
+    # EMPTY STATE GUIDE
+    if not any([prov, kab, kec, desa]):
+        return html_response(EMPTY_STATE_HTML, "public, max-age=86400, immutable")
+
+    return html_response(render_search_table(prov, prov_exact, kab, kab_exact, kec, kec_exact, desa, desa_exact, expand))
+
+@app.api_route("/static/{filename}", methods=["GET", "HEAD"])
+async def get_static(filename: str, request: Request):
+    asset = static_assets.get(filename)
+    if not asset: return Response(status_code=404)
+    version = request.query_params.get("v")
+    # ?v= dari isi lain (mis. HTML baru dilayani host lama saat rolling deploy): jangan kunci isi ini di URL itu
+    if version is not None and version != asset.etag[1:9]: return Response(status_code=404, headers={"Cache-Control": "no-store"})
+    # Hanya URL berversi yang boleh immutable; tanpa ?v= selalu revalidasi lewat ETag
+    cache_control = "public, max-age=31536000, immutable" if version else "no-cache"
+    return encoded_response(request, asset.variants, asset.media_type, {"Cache-Control": cache_control}, asset.etag)
 
 @app.get("/{level}")
 async def api_get_suggestions(level: str, query: str = "", prov: str = "", kabupaten: str = "", kecamatan: str = ""):
-    if level not in ["prov", "kabupaten", "kecamatan", "desa"]: return JSONResponse([])
-    results = get_cached_suggestions(level, query, prov, kabupaten, kecamatan)
-    return JSONResponse([{"kode": r[list(r.keys())[0]], "nama": r[list(r.keys())[1]]} for r in results])
+    if level not in ["prov", "kabupaten", "kecamatan", "desa"]: return ORJSONResponse([])
+    return Response(get_cached_suggestions(level, query, prov, kabupaten, kecamatan), media_type="application/json")
+
+# Muat data setelah semua fungsi ber-cache terdefinisi (load_data mengosongkan cache tersebut)
+load_data()
 
 # ==========================================
 # 5. FRONTEND TEMPLATE
 # ==========================================
-HTML_TEMPLATE = """
+TAILWIND_CDN_URL = "https://cdn.tailwindcss.com"
+FONTS_CSS_URL = "https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap"
+
+# Inter self-hosted (tanpa hop DNS/TLS ke fonts.googleapis.com + fonts.gstatic.com) jika semua berat tersedia
+FONT_WEIGHTS = (400, 500, 600, 700)
+FONT_PATHS = {weight: os.path.join("static", "fonts", f"inter-{weight}.woff2") for weight in FONT_WEIGHTS}
+FONT_URLS = {weight: register_static(path) for weight, path in FONT_PATHS.items()} if all(map(os.path.exists, FONT_PATHS.values())) else {}
+FONT_FACE_CSS = "".join(
+    f"@font-face {{ font-family: 'Inter'; font-style: normal; font-weight: {weight}; font-display: swap; src: url('{url}') format('woff2'); }}\n"
+    for weight, url in FONT_URLS.items()
+)
+FONTS_HEAD = "" if FONT_URLS else f"""<link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="{FONTS_CSS_URL}" rel="stylesheet">"""
+
+# Header Link preload: browser mulai mengambil script/stylesheet/font/logo sebelum <head> selesai diparse
+HTML_PRELOAD_LINKS = ", ".join([
+    f"<{TAILWIND_CSS_URL}>; rel=preload; as=style" if TAILWIND_CSS_URL else f"<{TAILWIND_CDN_URL}>; rel=preload; as=script",
+    f'<{FONT_URLS[400]}>; rel=preload; as=font; type="font/woff2"; crossorigin' if FONT_URLS else f"<{FONTS_CSS_URL}>; rel=preload; as=style",
+    f"<{LOGO_URL}>; rel=preload; as=image",
+])
+
+def minify_lines(text: str, line_comment: str = "") -> str:
+    """Minify konservatif sekali saat import: buang indentasi, baris kosong & baris komentar.
+
+    Satu newline antar baris dipertahankan, sehingga spasi antar-elemen inline HTML dan
+    automatic semicolon insertion JavaScript tidak berubah (tanpa dependensi minifier).
+    """
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line and not (line_comment and line.startswith(line_comment)))
+
+# CSS & JS halaman dilayani sebagai aset terpisah (di-cache browser immutable, lepas dari HTML);
+# script memakai defer sehingga tidak memblokir parsing HTML
+APP_CSS = FONT_FACE_CSS + """
+body { font-family: 'Inter', sans-serif; }
+*:focus-visible { outline: 2px solid #3b82f6; outline-offset: 2px; }
+
+/* Scrollbar */
+::-webkit-scrollbar { width: 8px; height: 8px; }
+::-webkit-scrollbar-track { background: transparent; }
+::-webkit-scrollbar-thumb { background: #cbd5e1; border-radius: 4px; }
+.dark ::-webkit-scrollbar-thumb { background: #475569; }
+::-webkit-scrollbar-thumb:hover { background: #94a3b8; }
+
+@keyframes slideUpFade { from { transform: translateY(10px); opacity: 0; } to { transform: translateY(0); opacity: 1; } }
+.animate-fade-in { animation: slideUpFade 0.4s ease-out forwards; }
+
+.toggle-checkbox:checked { right: 0; border-color: #2563eb; }
+.toggle-checkbox:checked + .toggle-label { background-color: #2563eb; }
+
+@media (max-width: 1024px) {
+    .responsive-table thead { display: none; }
+    .responsive-table, .responsive-table tbody, .responsive-table tr, .responsive-table td { display: block; width: 100%; }
+    .responsive-table tr { margin-bottom: 1rem; border-radius: 0.75rem; padding: 1.25rem; position: relative; }
+    .responsive-table td { display: flex; justify-content: space-between; align-items: center; padding: 0.75rem 0; border-bottom: 1px dashed #e2e8f0; text-align: right; }
+    .dark .responsive-table td { border-bottom-color: #334155; }
+    .responsive-table td:last-child { border-bottom: none; padding-top: 1.25rem; justify-content: flex-end; }
+    .responsive-table td::before { content: attr(data-label); font-weight: 700; font-size: 0.7rem; text-transform: uppercase; letter-spacing: 0.05em; margin-right: 1rem; opacity: 0.7; }
+}
+"""
+APP_CSS_URL = add_static("app.css", minify_lines(APP_CSS, "/*").encode("utf-8"))
+
+APP_JS = """
+// --- ELEMENT HANDLES ---
+// Elemen tetap di-resolve sekali saat init (script defer: DOM sudah lengkap), bukan getElementById per event
+const LEVELS = ['prov', 'kabupaten', 'kecamatan', 'desa'];
+const els = {};
+['theme-toggle', 'theme-toggle-dark-icon', 'theme-toggle-light-icon', 'expand-container', 'expand-label', 'expand-toggle', 'loading', 'hasil', 'sugg-tpl']
+    .forEach(id => { els[id] = document.getElementById(id); });
+LEVELS.forEach(level => { for (const id of [level, 'btn_clear_' + level, level + '_list']) els[id] = document.getElementById(id); });
+
+// --- THEME LOGIC ---
+// Class 'dark' sudah dipasang oleh script inline di <head> (sebelum paint); di sini cukup ikon yang sesuai
+els[document.documentElement.classList.contains('dark') ? 'theme-toggle-light-icon' : 'theme-toggle-dark-icon'].classList.remove('hidden');
+els['theme-toggle'].addEventListener('click', () => {
+    els['theme-toggle-dark-icon'].classList.toggle('hidden');
+    els['theme-toggle-light-icon'].classList.toggle('hidden');
+    if (document.documentElement.classList.contains('dark')) { document.documentElement.classList.remove('dark'); localStorage.setItem('color-theme', 'light'); }
+    else { document.documentElement.classList.add('dark'); localStorage.setItem('color-theme', 'dark'); }
+});
+
+// --- URL STATE SYNC ---
+// Satu objek URL dipakai ulang; replaceState ditunda ke waktu idle & digabung (beberapa sync -> satu tulis)
+const pageURL = new URL(window.location.href);
+const whenIdle = window.requestIdleCallback || ((cb) => setTimeout(cb, 1));
+let urlPending = false;
+function syncURL(params) {
+    for (const [key, value] of Object.entries(params)) { if(value) pageURL.searchParams.set(key, value); else pageURL.searchParams.delete(key); }
+    if (urlPending) return;
+    urlPending = true;
+    whenIdle(() => { urlPending = false; window.history.replaceState({}, '', pageURL); }, { timeout: 500 });
+}
+
+function restoreFromURL() {
+    const params = new URLSearchParams(window.location.search);
+    let hasData = false;
+    LEVELS.forEach(id => {
+        const val = params.get(id); if (val) { els[id].value = val; hasData = true; }
+    });
+    // FORCE LOAD: Even if empty, we want to show the "Guide" state
+    loadResults();
+}
+
+// --- SEARCH LOGIC ---
+let focusIndex = -1;
+// Satu closure `run` per fungsi yang di-debounce: tiap panggilan hanya menyimpan argumen terakhir & reset timer
+function debounce(fn, wait) { let t = 0, args; const run = () => fn.apply(null, args); return function () { args = arguments; clearTimeout(t); t = setTimeout(run, wait); }; }
+function showLoading(show) { els.loading.classList.toggle("hidden", !show); const hasil = els.hasil; if(show) hasil.classList.add("opacity-40"); else hasil.classList.remove("opacity-40"); }
+const getValue = (id) => { const el = els[id]; return el.dataset.kode || el.value; }
+
+function updateToggleState() {
+    const prov = getValue('prov'); const kab = getValue('kabupaten');
+    const kec = getValue('kecamatan'); const desa = getValue('desa');
+    const container = els['expand-container'];
+    const label = els['expand-label'];
+    const toggle = els['expand-toggle'];
+
+    if (prov && !kab) { container.classList.remove('hidden'); container.classList.add('flex'); label.textContent = "Tampilkan Kabupaten/Kota"; } 
+    else if (kab && !kec) { container.classList.remove('hidden'); container.classList.add('flex'); label.textContent = "Tampilkan Kecamatan"; } 
+    else if (kec && !desa) { container.classList.remove('hidden'); container.classList.add('flex'); label.textContent = "Tampilkan Desa"; } 
+    else { container.classList.add('hidden'); container.classList.remove('flex'); toggle.checked = false; }
+}
+
+function setupListeners(level, nextLevel) {
+    const input = els[level];
+    input.addEventListener('input', debounce(async (e) => {
+        const query = e.target.value.trim();
+        els["btn_clear_" + level].classList.toggle("hidden", query.length === 0);
+        input.dataset.exact = "false"; input.dataset.kode = ""; 
+        // Selama mengetik hanya autocomplete yang di-fetch; /search menunggu pilihan saran (selectItem) atau input dikosongkan
+        if (!query) { if (inflight[level]) inflight[level].abort(); els[level + "_list"].classList.add("hidden"); loadResults(true); return; }
+        await fetchAndRender(level, nextLevel, query);
+    }, 300));
+    // Satu listener per daftar saran (delegation), bukan closure onclick per item tiap render
+    const list = els[level + "_list"];
+    list.addEventListener('click', (e) => {
+        const item = e.target.closest(".suggestion-item");
+        if (item) selectItem(level, nextLevel, item.dataset.kode, item.dataset.nama);
+    });
+    // children = HTMLCollection live: selalu sinkron dengan render terakhir, tanpa querySelectorAll per tombol
+    const items = list.children;
+    input.addEventListener('keydown', (e) => {
+        if (items.length === 0 || list.classList.contains("hidden")) return;
+        switch (e.code) {
+            case "ArrowDown": focusIndex = (focusIndex + 1) % items.length; setActive(items); break;
+            case "ArrowUp": focusIndex = focusIndex <= 0 ? items.length - 1 : focusIndex - 1; setActive(items); break;
+            case "Enter": case "NumpadEnter": if (focusIndex > -1 && items[focusIndex]) items[focusIndex].click(); break;
+            case "Escape": list.classList.add("hidden"); return;
+            default: return;
+        }
+        e.preventDefault();
+    });
+}
+
+// Class item saran ada di <template id="sugg-tpl">; yang di-toggle via JS dikompilasi sekali di sini
+const SUGG_ACTIVE_CLASSES = ["bg-blue-50", "text-blue-700", "dark:bg-slate-700", "dark:text-white"];
+function setActive(items) {
+    for (const item of items) item.classList.remove(...SUGG_ACTIVE_CLASSES);
+    if (items[focusIndex]) { items[focusIndex].classList.add(...SUGG_ACTIVE_CLASSES); items[focusIndex].scrollIntoView({ block: "nearest" }); }
+}
+
+// --- CLIENT CACHE (LRU) ---
+// Map mempertahankan urutan sisip: get memindahkan key ke belakang, key terdepan = paling lama tidak dipakai
+// Batas per cache: JSON saran kecil (256 entri), HTML /search bisa ~300 KB per entri (24 entri)
+const SUGGEST_CACHE_MAX = 256, SEARCH_CACHE_MAX = 24;
+const suggestCache = new Map(), searchCache = new Map();
+function cacheGet(cache, key) { if (!cache.has(key)) return undefined; const value = cache.get(key); cache.delete(key); cache.set(key, value); return value; }
+function cachePut(cache, key, value, max) { cache.set(key, value); if (cache.size > max) cache.delete(cache.keys().next().value); }
+
+// Satu request saran aktif per level: ketikan baru membatalkan request lama (respons basi tidak menimpa)
+const inflight = {};
+async function fetchAndRender(level, nextLevel, query) {
+    // Hanya parameter yang terisi yang dikirim (default server: string kosong)
+    const params = new URLSearchParams();
+    params.set("query", query);
+    for (const parent of ["prov", "kabupaten", "kecamatan"]) { const kode = els[parent].dataset.kode; if (kode) params.set(parent, kode); }
+    if (inflight[level]) inflight[level].abort();
+    const url = `/${level}?${params.toString()}`;
+    const cached = cacheGet(suggestCache, url);
+    if (cached !== undefined) { inflight[level] = null; renderSuggestions(cached, level, nextLevel); return; }
+    const ac = new AbortController(); inflight[level] = ac;
+    try { const res = await fetch(url, { signal: ac.signal }); const data = await res.json(); if (res.ok) cachePut(suggestCache, url, data, SUGGEST_CACHE_MAX); renderSuggestions(data, level, nextLevel); } catch (err) {}
+}
+
+// Item saran di-clone dari <template> (parse HTML sekali) ke DocumentFragment di luar DOM, lalu dipasang
+// dengan satu replaceChildren(frag); list disembunyikan selama penggantian agar tidak ada layout setengah jadi
+const suggTpl = els['sugg-tpl'].content.firstElementChild;
+function renderSuggestions(data, level, nextLevel) {
+    const list = els[level + "_list"]; focusIndex = -1;
+    // Tanpa saran tidak akan ada pilihan -> tampilkan hasil /search untuk teks yang diketik (mis. "tidak ditemukan")
+    if (data.length === 0) { list.replaceChildren(); list.classList.add("hidden"); loadResults(true); return; }
+    if (data.length === 1) { list.replaceChildren(); selectItem(level, nextLevel, data[0].kode, data[0].nama); return; }
+    list.classList.add("hidden");
+    const frag = document.createDocumentFragment();
+    for (const d of data) {
+        const div = frag.appendChild(suggTpl.cloneNode(true));
+        div.firstElementChild.textContent = d.nama; div.lastElementChild.textContent = d.kode;
+        div.dataset.kode = d.kode; div.dataset.nama = d.nama;
+    }
+    list.replaceChildren(frag);
+    list.classList.remove("hidden");
+}
+
+function selectItem(level, nextLevel, kode, nama) {
+    const input = els[level];
+    input.value = nama; input.dataset.exact = "true";
+    const provVal = els.prov.dataset.kode;
+    const kabVal = els.kabupaten.dataset.kode;
+    const kecVal = els.kecamatan.dataset.kode;
+    let useCode = true;
+    if (level === "kabupaten" && !provVal) useCode = false;
+    if (level === "kecamatan" && !kabVal) useCode = false;
+    if (level === "desa" && !kecVal) useCode = false;
+    if (useCode) input.dataset.kode = kode; else input.dataset.kode = ""; 
+    els[level + "_list"].classList.add("hidden");
+    els["btn_clear_" + level].classList.remove("hidden");
+    loadResults(true);
+    if (nextLevel) { const nextInput = els[nextLevel]; if (nextInput && !nextInput.disabled) nextInput.focus(); }
+}
+
+const SEARCH_PARAMS = [['prov', 'prov'], ['kabupaten', 'kab'], ['kecamatan', 'kec'], ['desa', 'desa']];
+let searchController = null;
+const loadResults = debounce(async (updateUrl = false) => {
+    if (searchController) searchController.abort();
+    const ac = new AbortController(); searchController = ac;
+    showLoading(true);
+    try { 
+        updateToggleState(); 
+        const expand = els['expand-toggle'].checked;
+        const currentValues = { prov: els.prov.value, kabupaten: els.kabupaten.value, kecamatan: els.kecamatan.value, desa: els.desa.value };
+        if(updateUrl) syncURL(currentValues);
+
+        // Nilai kosong & flag false tidak dikirim (default server); URL lebih pendek & key cache lebih stabil
+        const params = new URLSearchParams();
+        for (const [id, key] of SEARCH_PARAMS) {
+            const value = getValue(id); if (!value) continue;
+            params.set(key, value);
+            if (els[id].dataset.exact === "true") params.set(key + "_exact", "true");
+        }
+        if (expand) params.set("expand", "true");
+        const url = `/search?${params.toString()}`;
+        let html = cacheGet(searchCache, url);
+        if (html === undefined) {
+            const res = await fetch(url, { signal: ac.signal }); 
+            html = await res.text(); 
+            if (res.ok) cachePut(searchCache, url, html, SEARCH_CACHE_MAX);
+        }
+        els.hasil.innerHTML = html; 
+    } catch (err) { } finally { if (searchController === ac) showLoading(false); }
+}, 400);
+
+function clearLevel(level) {
+    const el = els[level]; el.value = ""; el.dataset.kode = ""; el.dataset.exact = "false";
+    els["btn_clear_" + level].classList.add("hidden");
+    els['expand-toggle'].checked = false; 
+    loadResults(true);
+}
+
+function resetFilter() {
+    LEVELS.forEach(id => {
+        const el = els[id]; el.value = ""; el.dataset.kode = ""; el.dataset.exact = "false";
+        els["btn_clear_" + id].classList.add("hidden");
+    });
+    els['expand-toggle'].checked = false;
+    loadResults(true);
+}
+
+// Klik di luar field pencarian menutup semua daftar saran (node daftar sudah di-cache, tanpa querySelectorAll)
+const LISTS = LEVELS.map(level => els[level + '_list']);
+document.addEventListener('click', (e) => {
+    if (!e.target.closest('.relative.group')) for (const list of LISTS) list.classList.add('hidden');
+}, { passive: true });
+
+els['expand-toggle'].addEventListener('click', (e) => {
+    const dot = e.target.nextElementSibling.nextElementSibling;
+    if(e.target.checked) { dot.classList.add('translate-x-full', 'border-white'); } 
+    else { dot.classList.remove('translate-x-full', 'border-white'); }
+}, { passive: true });
+
+// Tombol salin hanya ada di tabel hasil -> delegation di container #hasil, bukan di seluruh dokumen
+els.hasil.addEventListener('click', (e) => {
+    const btn = e.target.closest('.btn-copy');
+    if (btn) {
+        const { prov, kab, kec, desa } = btn.dataset;
+        let text = `'${prov}`; if(kab) text += `\\t'${kab}`; if(kec) text += `\\t'${kec}`; if(desa) text += `\\t'${desa}`;
+        navigator.clipboard.writeText(text).then(() => {
+            const originalHTML = btn.innerHTML;
+            btn.innerHTML = `<svg class="w-5 h-5 text-emerald-500" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2.5" d="M5 13l4 4L19 7"></path></svg>`;
+            btn.classList.add("bg-emerald-50", "border-emerald-100");
+            setTimeout(() => { btn.innerHTML = originalHTML; btn.classList.remove("bg-emerald-50", "border-emerald-100"); }, 1500);
+        });
+    }
+});
+
+setupListeners('prov', 'kabupaten'); setupListeners('kabupaten', 'kecamatan'); setupListeners('kecamatan', 'desa'); setupListeners('desa', null);
+restoreFromURL(); 
+"""
+APP_JS_URL = add_static("app.js", minify_lines(APP_JS, "//").encode("utf-8"))
+
+TAILWIND_HEAD = f'<link rel="stylesheet" href="{TAILWIND_CSS_URL}">' if TAILWIND_CSS_URL else f"""<link rel="preconnect" href="{TAILWIND_CDN_URL}">
+    <script src="{TAILWIND_CDN_URL}"></script>
+    <script>
+        tailwind.config = {{ darkMode: 'class', theme: {{ extend: {{ fontFamily: {{ sans: ['Inter', 'sans-serif'] }} }} }} }}
+    </script>"""
+
+HTML_TEMPLATE = f"""
 <!DOCTYPE html>
 <html lang="id" class="scroll-smooth">
 <head>
@@ -288,46 +1101,15 @@ HTML_TEMPLATE = """
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Master Wilayah Indonesia</title>
     <meta name="description" content="Cari kode wilayah administrasi Indonesia.">
-    <link rel="icon" type="image/png" href="/static/{logo_filename}">
-    
-    <meta property="og:image" content="/static/{logo_filename}">
+    <link rel="icon" type="image/png" href="{LOGO_URL}">
     
-    <link rel="preconnect" href="https://cdn.tailwindcss.com">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <meta property="og:image" content="{LOGO_URL}">
     
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script>
-        tailwind.config = { darkMode: 'class', theme: { extend: { fontFamily: { sans: ['Inter', 'sans-serif'] } } } }
-    </script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&family=JetBrains+Mono:wght@500&display=swap" rel="stylesheet">
-    
-    <style>
-        body { font-family: 'Inter', sans-serif; }
-        *:focus-visible { outline: 2px solid #3b82f6; outline-offset: 2px; }
-        
-        /* Scrollbar */
-        ::-webkit-scrollbar { width: 8px; height: 8px; }
-        ::-webkit-scrollbar-track { background: transparent; }
-        ::-webkit-scrollbar-thumb { background: #cbd5e1; border-radius: 4px; }
-        .dark ::-webkit-scrollbar-thumb { background: #475569; }
-        ::-webkit-scrollbar-thumb:hover { background: #94a3b8; }
-        
-        @keyframes slideUpFade { from { transform: translateY(10px); opacity: 0; } to { transform: translateY(0); opacity: 1; } }
-        .animate-fade-in { animation: slideUpFade 0.4s ease-out forwards; }
-
-        .toggle-checkbox:checked { right: 0; border-color: #2563eb; }
-        .toggle-checkbox:checked + .toggle-label { background-color: #2563eb; }
-        
-        @media (max-width: 1024px) {
-            .responsive-table thead { display: none; }
-            .responsive-table, .responsive-table tbody, .responsive-table tr, .responsive-table td { display: block; width: 100%; }
-            .responsive-table tr { margin-bottom: 1rem; border-radius: 0.75rem; padding: 1.25rem; position: relative; }
-            .responsive-table td { display: flex; justify-content: space-between; align-items: center; padding: 0.75rem 0; border-bottom: 1px dashed #e2e8f0; text-align: right; }
-            .dark .responsive-table td { border-bottom-color: #334155; }
-            .responsive-table td:last-child { border-bottom: none; padding-top: 1.25rem; justify-content: flex-end; }
-            .responsive-table td::before { content: attr(data-label); font-weight: 700; font-size: 0.7rem; text-transform: uppercase; letter-spacing: 0.05em; margin-right: 1rem; opacity: 0.7; }
-        }
-    </style>
+    {TAILWIND_HEAD}
+    {FONTS_HEAD}
+    <link rel="stylesheet" href="{APP_CSS_URL}">
+    <script>if (localStorage.getItem('color-theme') === 'dark' || (!('color-theme' in localStorage) && window.matchMedia('(prefers-color-scheme: dark)').matches)) document.documentElement.classList.add('dark');</script>
+    <script src="{APP_JS_URL}" defer></script>
 </head>
 <body class="min-h-screen flex flex-col bg-slate-50 text-slate-900 dark:bg-slate-900 dark:text-slate-100 transition-colors duration-300">
 
@@ -336,7 +1118,7 @@ HTML_TEMPLATE = """
             <div class="flex justify-between h-16 items-center">
                 <div class="flex items-center gap-3.5">
                     <div class="h-11 w-11 bg-white rounded-lg flex items-center justify-center shadow-sm border border-white/10">
-                        <img src="/static/{logo_filename}" alt="Logo" class="h-full w-full object-contain p-1">
+                        <img src="{LOGO_URL}" alt="Logo" class="h-full w-full object-contain p-1">
                     </div>
                     
                     <div>
@@ -414,190 +1196,34 @@ HTML_TEMPLATE = """
         </div>
     </footer>
 
-    <script>
-        // --- THEME LOGIC ---
-        const themeBtn = document.getElementById('theme-toggle');
-        if (localStorage.getItem('color-theme') === 'dark' || (!('color-theme' in localStorage) && window.matchMedia('(prefers-color-scheme: dark)').matches)) {
-            document.documentElement.classList.add('dark'); document.getElementById('theme-toggle-light-icon').classList.remove('hidden');
-        } else {
-            document.documentElement.classList.remove('dark'); document.getElementById('theme-toggle-dark-icon').classList.remove('hidden');
-        }
-        themeBtn.addEventListener('click', () => {
-            document.getElementById('theme-toggle-dark-icon').classList.toggle('hidden');
-            document.getElementById('theme-toggle-light-icon').classList.toggle('hidden');
-            if (document.documentElement.classList.contains('dark')) { document.documentElement.classList.remove('dark'); localStorage.setItem('color-theme', 'light'); }
-            else { document.documentElement.classList.add('dark'); localStorage.setItem('color-theme', 'dark'); }
-        });
-
-        // --- URL STATE SYNC ---
-        function syncURL(params) {
-            const url = new URL(window.location);
-            for (const [key, value] of Object.entries(params)) { if(value) url.searchParams.set(key, value); else url.searchParams.delete(key); }
-            window.history.replaceState({}, '', url);
-        }
-        
-        function restoreFromURL() {
-            const params = new URLSearchParams(window.location.search);
-            let hasData = false;
-            ['prov', 'kabupaten', 'kecamatan', 'desa'].forEach(id => {
-                const val = params.get(id); if (val) { document.getElementById(id).value = val; hasData = true; }
-            });
-            // FORCE LOAD: Even if empty, we want to show the "Guide" state
-            loadResults();
-        }
-
-        // --- SEARCH LOGIC ---
-        let focusIndex = -1;
-        const debounce = (func, wait) => { let t; return (...args) => { clearTimeout(t); t = setTimeout(() => func.apply(this, args), wait); }; };
-        function showLoading(show) { document.getElementById("loading").classList.toggle("hidden", !show); const hasil = document.getElementById("hasil"); if(show) hasil.classList.add("opacity-40"); else hasil.classList.remove("opacity-40"); }
-        const getValue = (id) => { const el = document.getElementById(id); return el.dataset.kode || el.value; }
-
-        function updateToggleState() {
-            const prov = getValue('prov'); const kab = getValue('kabupaten');
-            const kec = getValue('kecamatan'); const desa = getValue('desa');
-            const container = document.getElementById('expand-container');
-            const label = document.getElementById('expand-label');
-            const toggle = document.getElementById('expand-toggle');
-
-            if (prov && !kab) { container.classList.remove('hidden'); container.classList.add('flex'); label.textContent = "Tampilkan Kabupaten/Kota"; } 
-            else if (kab && !kec) { container.classList.remove('hidden'); container.classList.add('flex'); label.textContent = "Tampilkan Kecamatan"; } 
-            else if (kec && !desa) { container.classList.remove('hidden'); container.classList.add('flex'); label.textContent = "Tampilkan Desa"; } 
-            else { container.classList.add('hidden'); container.classList.remove('flex'); toggle.checked = false; }
-        }
-
-        function setupListeners(level, nextLevel) {
-            const input = document.getElementById(level);
-            input.addEventListener('input', debounce(async (e) => {
-                const query = e.target.value.trim();
-                document.getElementById("btn_clear_" + level).classList.toggle("hidden", query.length === 0);
-                input.dataset.exact = "false"; input.dataset.kode = ""; 
-                loadResults(true);
-                if (!query) { document.getElementById(level + "_list").classList.add("hidden"); return; }
-                await fetchAndRender(level, nextLevel, query);
-            }, 300));
-            input.addEventListener('keydown', (e) => {
-                const list = document.getElementById(level + "_list");
-                const items = list.querySelectorAll(".suggestion-item");
-                if (list.classList.contains("hidden") || items.length === 0) return;
-                if (e.key === "ArrowDown") { e.preventDefault(); focusIndex++; if (focusIndex >= items.length) focusIndex = 0; setActive(items); }
-                else if (e.key === "ArrowUp") { e.preventDefault(); focusIndex--; if (focusIndex < 0) focusIndex = items.length - 1; setActive(items); }
-                else if (e.key === "Enter") { e.preventDefault(); if (focusIndex > -1 && items[focusIndex]) items[focusIndex].click(); }
-                else if (e.key === "Escape") list.classList.add("hidden");
-            });
-        }
-
-        function setActive(items) {
-            items.forEach(item => { item.classList.remove("bg-blue-50", "text-blue-700", "dark:bg-slate-700", "dark:text-white"); });
-            if (items[focusIndex]) { items[focusIndex].classList.add("bg-blue-50", "text-blue-700", "dark:bg-slate-700", "dark:text-white"); items[focusIndex].scrollIntoView({ block: "nearest" }); }
-        }
-
-        async function fetchAndRender(level, nextLevel, query) {
-            const params = new URLSearchParams({ query, prov: document.getElementById("prov").dataset.kode || "", kabupaten: document.getElementById("kabupaten").dataset.kode || "", kecamatan: document.getElementById("kecamatan").dataset.kode || "" });
-            try { const res = await fetch(`/${level}?${params.toString()}`); const data = await res.json(); renderSuggestions(data, level, nextLevel); } catch (err) {}
-        }
-
-        function renderSuggestions(data, level, nextLevel) {
-            const list = document.getElementById(level + "_list"); list.innerHTML = ""; focusIndex = -1;
-            if (data.length === 0) { list.classList.add("hidden"); return; }
-            if (data.length === 1) { selectItem(level, nextLevel, data[0].kode, data[0].nama); return; }
-            list.classList.remove("hidden");
-            data.forEach((d) => {
-                const div = document.createElement("div");
-                div.className = "suggestion-item px-4 py-2.5 cursor-pointer text-sm text-slate-700 dark:text-slate-300 flex justify-between items-center border-b border-slate-50 dark:border-slate-700 last:border-0 hover:bg-blue-50 dark:hover:bg-slate-700 transition-colors";
-                div.innerHTML = `<span class="font-medium">${d.nama}</span><span class="text-xs font-mono font-bold text-blue-600 dark:text-blue-400 bg-blue-50 dark:bg-slate-900 px-2 py-0.5 rounded border border-blue-100 dark:border-slate-600">${d.kode}</span>`;
-                div.onclick = () => selectItem(level, nextLevel, d.kode, d.nama);
-                list.appendChild(div);
-            });
-        }
-
-        function selectItem(level, nextLevel, kode, nama) {
-            const input = document.getElementById(level);
-            input.value = nama; input.dataset.exact = "true";
-            const provVal = document.getElementById("prov").dataset.kode;
-            const kabVal = document.getElementById("kabupaten").dataset.kode;
-            const kecVal = document.getElementById("kecamatan").dataset.kode;
-            let useCode = true;
-            if (level === "kabupaten" && !provVal) useCode = false;
-            if (level === "kecamatan" && !kabVal) useCode = false;
-            if (level === "desa" && !kecVal) useCode = false;
-            if (useCode) input.dataset.kode = kode; else input.dataset.kode = ""; 
-            document.getElementById(level + "_list").classList.add("hidden");
-            document.getElementById("btn_clear_" + level).classList.remove("hidden");
-            loadResults(true);
-            if (nextLevel) { const nextInput = document.getElementById(nextLevel); if (nextInput && !nextInput.disabled) nextInput.focus(); }
-        }
-
-        const loadResults = debounce(async (updateUrl = false) => {
-            showLoading(true);
-            try { 
-                updateToggleState(); 
-                const expand = document.getElementById('expand-toggle').checked;
-                const currentValues = { prov: document.getElementById('prov').value, kabupaten: document.getElementById('kabupaten').value, kecamatan: document.getElementById('kecamatan').value, desa: document.getElementById('desa').value };
-                if(updateUrl) syncURL(currentValues);
-
-                const params = new URLSearchParams({ 
-                    prov: getValue('prov'), prov_exact: document.getElementById("prov").dataset.exact === "true",
-                    kab: getValue('kabupaten'), kab_exact: document.getElementById("kabupaten").dataset.exact === "true",
-                    kec: getValue('kecamatan'), kec_exact: document.getElementById("kecamatan").dataset.exact === "true",
-                    desa: getValue('desa'), desa_exact: document.getElementById("desa").dataset.exact === "true",
-                    expand: expand 
-                });
-                const res = await fetch(`/search?${params.toString()}`); 
-                const html = await res.text(); 
-                document.getElementById("hasil").innerHTML = html; 
-            } catch (err) { } finally { showLoading(false); }
-        }, 400);
-
-        function clearLevel(level) {
-            const el = document.getElementById(level); el.value = ""; el.dataset.kode = ""; el.dataset.exact = "false";
-            document.getElementById("btn_clear_" + level).classList.add("hidden");
-            document.getElementById('expand-toggle').checked = false; 
-            loadResults(true);
-        }
-        
-        function resetFilter() {
-            ['prov', 'kabupaten', 'kecamatan', 'desa'].forEach(id => {
-                const el = document.getElementById(id); el.value = ""; el.dataset.kode = ""; el.dataset.exact = "false";
-                document.getElementById("btn_clear_" + id).classList.add("hidden");
-            });
-            document.getElementById('expand-toggle').checked = false;
-            loadResults(true);
-        }
-
-        document.addEventListener('click', function(e) {
-            if (!e.target.closest('.relative.group')) document.querySelectorAll('[id$="_list"]').forEach(el => el.classList.add('hidden'));
-            if (e.target.id === 'expand-toggle') {
-                const dot = e.target.nextElementSibling.nextElementSibling;
-                if(e.target.checked) { dot.classList.add('translate-x-full', 'border-white'); } 
-                else { dot.classList.remove('translate-x-full', 'border-white'); }
-            }
-            const btn = e.target.closest('.btn-copy');
-            if (btn) {
-                const { prov, kab, kec, desa } = btn.dataset;
-                let text = `'${prov}`; if(kab) text += `\t'${kab}`; if(kec) text += `\t'${kec}`; if(desa) text += `\t'${desa}`;
-                navigator.clipboard.writeText(text).then(() => {
-                    const originalHTML = btn.innerHTML;
-                    btn.innerHTML = `<svg class="w-5 h-5 text-emerald-500" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2.5" d="M5 13l4 4L19 7"></path></svg>`;
-                    btn.classList.add("bg-emerald-50", "border-emerald-100");
-                    setTimeout(() => { btn.innerHTML = originalHTML; btn.classList.remove("bg-emerald-50", "border-emerald-100"); }, 1500);
-                });
-            }
-        });
-
-        setupListeners('prov', 'kabupaten'); setupListeners('kabupaten', 'kecamatan'); setupListeners('kecamatan', 'desa'); setupListeners('desa', null);
-        restoreFromURL(); 
-    </script>
+    <template id="sugg-tpl">
+        <div class="suggestion-item px-4 py-2.5 cursor-pointer text-sm text-slate-700 dark:text-slate-300 flex justify-between items-center border-b border-slate-50 dark:border-slate-700 last:border-0 hover:bg-blue-50 dark:hover:bg-slate-700 transition-colors"><span class="sugg-nama font-medium"></span><span class="sugg-kode text-xs font-mono font-bold text-blue-600 dark:text-blue-400 bg-blue-50 dark:bg-slate-900 px-2 py-0.5 rounded border border-blue-100 dark:border-slate-600"></span></div>
+    </template>
 </body>
 </html>
-""".replace("{logo_filename}", LOGO_FILENAME)
+"""
 
-@app.get("/", response_class=HTMLResponse)
-async def read_root():
-    return HTML_TEMPLATE
+# Halaman statis: minify + encode + kompresi sekali saat import, bukan dikompresi ulang oleh middleware tiap request
+HTML_BYTES = minify_lines(HTML_TEMPLATE, "<!--").encode("utf-8")
+HTML_VARIANTS = compress_variants(HTML_BYTES, "text/html")
+HTML_ETAG = '"' + hashlib.md5(HTML_BYTES).hexdigest() + '"'
+
+async def read_root(request: Request) -> Response:
+    # no-cache: browser selalu revalidasi via ETag (304 tanpa body), jadi URL aset ?v=hash baru langsung terpakai setelah deploy
+    headers = {"Cache-Control": "no-cache, must-revalidate", "Link": HTML_PRELOAD_LINKS}
+    return encoded_response(request, HTML_VARIANTS, "text/html", headers, HTML_ETAG)
+
+# Route Starlette polos (bukan @app.get): halaman statis tidak butuh validasi parameter/dependency FastAPI
+app.add_route("/", read_root, methods=["GET", "HEAD"], include_in_schema=False)
 
 # ==========================================
 # 6. SERVER RUN
 # ==========================================
 if __name__ == "__main__":
     logger.info("🚀 Memulai server di http://127.0.0.1:8000")
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    # WORKERS > 1: tiap worker mengimpor modul ini & me-mmap master.arrow yang sudah ditulis proses induk
+    workers = int(os.environ.get("WORKERS", "1"))
+    if workers > 1:
+        uvicorn.run("data_master:app", host="127.0.0.1", port=8000, workers=workers)
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -0,0 +1,12 @@
+// Build CSS Tailwind statis (hanya class yang dipakai di data_master.py):
+//   npx tailwindcss@3 -c tailwind.config.js -o static/tailwind.min.css --minify
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  content: ["./data_master.py"],
+  darkMode: "class",
+  theme: {
+    extend: {
+      fontFamily: { sans: ["Inter", "sans-serif"] },
+    },
+  },
+};
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+import data_master
+
+client = TestClient(data_master.app)
+
+
+def test_gzip_q0_gets_identity_body_and_etag():
+    # gzip;q=0 berarti ditolak: GZipMiddleware tidak boleh mengompres body identity hasil negosiasi
+    for accept in ("gzip;q=0", "br;q=0, gzip;q=0"):
+        response = client.get("/", headers={"Accept-Encoding": accept})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == data_master.HTML_ETAG
+        assert response.content == data_master.HTML_BYTES
+
+
+def test_gzip_gets_gzip_variant_and_etag():
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == data_master.HTML_ETAG[:-1] + '-gzip"'
+
+
+def test_static_answers_head():
+    asset = data_master.static_assets["app.js"]
+    response = client.head(f"/static/app.js?v={asset.etag[1:9]}")
+    assert response.status_code == 200
+    assert response.content == b""